@@ -2,18 +2,18 @@
 """Diagnose New Relic API key issues."""
 
 import os
+import re
 from pathlib import Path
 
+# Matches KEY=value lines, skipping comments; one pass over the whole file.
+_ENV_LINE_RE = re.compile(r'^\s*(?!#)([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$', re.M)
+
 # Load .env file if it exists
 env_file = Path(__file__).parent / ".env"
 if env_file.exists():
     print("✓ Found .env file")
-    with open(env_file) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ[key] = value
+    for key, value in _ENV_LINE_RE.findall(env_file.read_text()):
+        os.environ[key] = value
 else:
     print("⚠ No .env file found")
 
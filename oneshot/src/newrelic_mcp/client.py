@@ -1,9 +1,20 @@
 """New Relic API client for querying logs."""
 
-import json
+import asyncio
+import contextlib
+import functools
+import gc
 import logging
+import random
+import re
+import time
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
+
 import httpx
+import ijson
+import orjson
 
 from .models import LogQueryRequest, LogQueryResponse, LogEntry
 
@@ -12,6 +23,113 @@ logger = logging.getLogger(__name__)
 # Maximum response size in characters to avoid token limits
 MAX_RESPONSE_SIZE = 20000
 
+# How long query_logs waits for more concurrent callers before sending,
+# so bursts of tool calls coalesce into one GraphQL request.
+BATCH_WINDOW_SECONDS = 0.01
+
+# Most sub-queries merged into one GraphQL document; larger bursts are
+# split so a single oversized document doesn't stall every caller in it.
+MAX_BATCH_SIZE = 10
+
+# Rate-limit retry budget: attempts and the longest single backoff sleep.
+MAX_RETRIES = 5
+MAX_RETRY_DELAY = 30.0
+
+# How long the cached account list stays valid before it is re-fetched,
+# so newly created accounts eventually show up.
+ACCOUNT_CACHE_TTL = 600.0
+
+# Distinct (account, NRQL) request bodies kept pre-encoded.
+BODY_CACHE_SIZE = 128
+
+# Row count above which generational GC is paused while a response is
+# materialized; below it the bookkeeping isn't worth saving.
+GC_PAUSE_THRESHOLD = 500
+
+# Split timeouts: NRDB can chew on a query for a while (read), but
+# connecting and acquiring a pooled connection should fail fast so the
+# backoff loop gets a chance instead of burning one flat 30s budget.
+REQUEST_TIMEOUT = httpx.Timeout(connect=5.0, read=25.0, write=5.0, pool=2.0)
+
+# Static GraphQL documents; account ID and NRQL are passed as variables so the
+# documents never need per-call formatting or quote escaping.
+LOG_QUERY_GQL = """
+query($accountId: Int!, $nrql: Nrql!) {
+  actor {
+    account(id: $accountId) {
+      nrql(query: $nrql) {
+        results
+        totalResult
+        metadata {
+          eventTypes
+          facets
+          messages
+        }
+      }
+    }
+  }
+}
+"""
+
+ACCOUNTS_GQL = """
+{
+  actor {
+    accounts {
+      id
+      name
+    }
+  }
+}
+"""
+
+# The accounts request body never varies, so build it once. (Kept a plain
+# dict: httpx JSON-encodes it and stdlib json rejects mapping proxies.)
+ACCOUNTS_PAYLOAD = {"query": ACCOUNTS_GQL}
+
+# Matches string filter values that should be emitted as bare NRQL numbers.
+_NUM_RE = re.compile(r'^-?\d+(\.\d+)?$')
+
+
+def _nrql_string(value: str) -> str:
+    """Quote a string for use as an NRQL literal, escaping embedded quotes."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+@contextlib.contextmanager
+def _gc_paused(active: bool):
+    """Pause generational GC around bulk LogEntry construction.
+
+    Building thousands of entries makes the collector repeatedly walk the
+    brand-new containers for garbage that isn't there; pausing and doing
+    one young-generation sweep afterwards is cheaper.
+    """
+    if not (active and gc.isenabled()):
+        yield
+        return
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+        gc.collect(0)
+
+
+class _AsyncByteReader:
+    """Minimal async file-like adapter feeding an httpx byte stream to ijson."""
+
+    def __init__(self, byte_iterator):
+        self._iterator = byte_iterator
+        self._buffer = b""
+
+    async def read(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            try:
+                self._buffer += await self._iterator.__anext__()
+            except StopAsyncIteration:
+                break
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
 
 class NewRelicClient:
     """Client for interacting with New Relic GraphQL API."""
@@ -28,227 +146,461 @@ class NewRelicClient:
         
         self.api_key = api_key
         self.endpoint = endpoint
-        self.headers = {
+        # Immutable view: the headers are set once on the shared client and
+        # must not drift per-request.
+        self.headers = MappingProxyType({
             "Content-Type": "application/json",
-            "API-Key": api_key
-        }
-    
+            "API-Key": api_key,
+            # Prefer brotli; it shrinks repetitive log JSON far better than
+            # gzip and httpx decompresses it transparently.
+            "Accept-Encoding": "br, gzip"
+        })
+        # Lowercased account name -> ID, populated from one accounts query
+        # and refreshed after ACCOUNT_CACHE_TTL.
+        self._account_map: Optional[Dict[str, str]] = None
+        self._account_names: List[str] = []
+        self._account_map_time = 0.0
+        # Serializes cache refreshes so concurrent cold lookups trigger
+        # one accounts query, not a thundering herd.
+        self._account_lock = asyncio.Lock()
+        # (account_id, nrql) -> pre-encoded request body, LRU-evicted.
+        self._body_cache: OrderedDict = OrderedDict()
+        # Concurrent query_logs callers parked here until the batch window
+        # closes; each entry is (request, future awaiting its response).
+        self._pending: List[tuple] = []
+        # Single long-lived client so repeated queries reuse pooled connections
+        # instead of paying a new TCP + TLS handshake per call.
+        self._client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            headers=self.headers,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            http2=True
+        )
+
+    async def aclose(self):
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """Backoff before retrying a rate-limited request.
+
+        Honors the server's Retry-After header when present, otherwise
+        jittered exponential backoff capped at MAX_RETRY_DELAY.
+        """
+        header = response.headers.get("Retry-After")
+        if header:
+            try:
+                return min(MAX_RETRY_DELAY, float(header))
+            except ValueError:
+                pass
+        return min(MAX_RETRY_DELAY, 2 ** attempt + random.random())
+
+    async def _post(self, payload: Dict[str, Any]) -> httpx.Response:
+        """POST a GraphQL payload, retrying with backoff on 429."""
+        for attempt in range(MAX_RETRIES):
+            response = await self._client.post(self.endpoint, json=payload)
+            if response.status_code != 429:
+                response.raise_for_status()
+                return response
+            delay = self._retry_delay(response, attempt)
+            logger.warning("Rate limited (attempt %d/%d); retrying in %.1fs", attempt + 1, MAX_RETRIES, delay)
+            await asyncio.sleep(delay)
+        raise Exception(f"Rate limit exceeded after {MAX_RETRIES} attempts. Please wait before retrying.")
+
     def _build_nrql_query(self, request: LogQueryRequest) -> str:
         """Build NRQL query from request parameters.
-        
+
         Args:
             request: Log query request
-            
+
         Returns:
             NRQL query string
         """
-        if request.query:
-            return request.query
-        
-        # Start with basic SELECT
-        nrql = "SELECT * FROM Log"
-        
+        return self._build_nrql(
+            request.query,
+            tuple(request.fields) if request.fields else None,
+            request.message_search,
+            tuple(sorted(request.filters.items())) if request.filters else None,
+            request.since,
+            request.limit
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_nrql(query: Optional[str], fields: Optional[tuple],
+                    message_search: Optional[str], filters: Optional[tuple],
+                    since: str, limit: int) -> str:
+        """Build (and cache) the NRQL string for one request shape.
+
+        Pollers tend to repeat identical requests, so the string is
+        assembled once per distinct shape and served from the LRU after.
+        """
+        if query:
+            return query
+
+        # Project only the requested fields; pulling every attribute with
+        # SELECT * is what blows up payload size and forces truncation.
+        if fields:
+            nrql = f"SELECT {', '.join(fields)} FROM Log"
+        else:
+            # Fast path for the bare "recent logs" shape (no search, no
+            # filters): skip the WHERE machinery entirely and go straight
+            # to the template.
+            if not message_search and not filters:
+                return f"SELECT timestamp, message, level FROM Log SINCE {since} LIMIT {limit}"
+            nrql = "SELECT timestamp, message, level FROM Log"
+
         # Build WHERE clause
         where_conditions = []
-        
-        if request.message_search:
-            where_conditions.append(f"message LIKE '%{request.message_search}%'")
-        
-        if request.filters:
-            for key, value in request.filters.items():
-                # Handle different value types
-                if value.lower() in ('true', 'false'):
+
+        if message_search:
+            where_conditions.append(f"message LIKE {_nrql_string('%' + message_search + '%')}")
+
+        if filters:
+            for key, value in filters:
+                # The Python type drives the NRQL literal type; strings are
+                # only demoted to bare literals when they look like one.
+                if isinstance(value, bool):
+                    where_conditions.append(f"{key} = {str(value).lower()}")
+                elif isinstance(value, (int, float)):
+                    where_conditions.append(f"{key} = {value}")
+                elif value.lower() in ('true', 'false'):
                     where_conditions.append(f"{key} = {value.lower()}")
-                elif value.replace('.', '').replace('-', '').isdigit():
+                elif _NUM_RE.match(value):
                     where_conditions.append(f"{key} = {value}")
                 else:
-                    where_conditions.append(f"{key} = '{value}'")
-        
+                    where_conditions.append(f"{key} = {_nrql_string(value)}")
+
         if where_conditions:
             nrql += " WHERE " + " AND ".join(where_conditions)
-        
+
         # Add time range
-        nrql += f" SINCE {request.since}"
-        
+        nrql += f" SINCE {since}"
+
         # Add limit
-        nrql += f" LIMIT {request.limit}"
-        
+        nrql += f" LIMIT {limit}"
+
         return nrql
     
-    def _estimate_response_size(self, logs: List[LogEntry]) -> int:
-        """Estimate the size of the JSON response in characters.
-        
-        Args:
-            logs: List of log entries
-            
-        Returns:
-            Estimated size in characters
+    # Fixed serialization cost of the response envelope (total_results,
+    # query_executed, truncation fields, surrounding braces).
+    _RESPONSE_OVERHEAD = 300
+
+    @staticmethod
+    def _entry_size(log: LogEntry) -> int:
+        """Serialized size of one log entry, including the list separator."""
+        return len(orjson.dumps({
+            "timestamp": log.timestamp_str if log.timestamp else None,
+            "message": log.message,
+            "level": log.level,
+            "attributes": log.attributes
+        }, option=orjson.OPT_INDENT_2)) + 2  # comma + newline between entries
+
+    @staticmethod
+    def _row_to_log_entry(result: Dict[str, Any]) -> LogEntry:
+        """Convert a decoded NRDB result row to a LogEntry.
+
+        Popping the known keys leaves the decoded row itself as the
+        attributes dict — no per-row dict comprehension or membership
+        scans.
         """
-        # Create a sample response to measure size
-        sample_response = LogQueryResponse(
-            logs=logs,
-            total_results=len(logs),
-            query_executed="sample query"
+        timestamp = result.pop("timestamp", None)
+        message = result.pop("message", "")
+        level = result.pop("level", "INFO")
+        return LogEntry(
+            timestamp=timestamp,
+            message=message,
+            level=level,
+            attributes=result
         )
-        return len(sample_response.to_json())
-    
-    def _truncate_logs_to_size(self, logs: List[LogEntry], max_size: int) -> tuple[List[LogEntry], bool]:
-        """Truncate logs list to fit within size limit.
-        
-        Args:
-            logs: Original list of log entries
-            max_size: Maximum allowed size in characters
-            
+
+    async def _parse_log_stream(self, response: httpx.Response,
+                                max_size: int) -> tuple[List[LogEntry], Optional[int], bool]:
+        """Incrementally parse an NRDB GraphQL response body.
+
+        Rows are converted to LogEntry objects as bytes arrive; parsing
+        stops as soon as the serialized response would exceed max_size, so
+        oversized bodies are neither fully buffered nor fully decoded.
+
         Returns:
-            Tuple of (truncated_logs, was_truncated)
+            Tuple of (logs, total_results_or_None, was_truncated)
         """
-        if not logs:
-            return logs, False
-        
-        # Binary search to find the maximum number of logs that fit
-        left, right = 1, len(logs)
-        best_fit = 0
-        
-        while left <= right:
-            mid = (left + right) // 2
-            test_logs = logs[:mid]
-            
-            if self._estimate_response_size(test_logs) <= max_size:
-                best_fit = mid
-                left = mid + 1
-            else:
-                right = mid - 1
-        
-        if best_fit < len(logs):
-            return logs[:best_fit], True
-        else:
-            return logs, False
-    
+        reader = _AsyncByteReader(response.aiter_bytes().__aiter__())
+        logs: List[LogEntry] = []
+        total_results: Optional[int] = None
+        errors: List[str] = []
+        was_truncated = False
+        total_size = self._RESPONSE_OVERHEAD
+        row_builder = None
+
+        async for prefix, event, value in ijson.parse_async(reader):
+            if prefix == "data.actor.account.nrql.results.item" and event == "start_map":
+                row_builder = ijson.ObjectBuilder()
+            if row_builder is not None:
+                row_builder.event(event, value)
+                if prefix == "data.actor.account.nrql.results.item" and event == "end_map":
+                    log = self._row_to_log_entry(row_builder.value)
+                    row_builder = None
+                    total_size += self._entry_size(log)
+                    if total_size > max_size and logs:
+                        was_truncated = True
+                        break
+                    logs.append(log)
+            elif prefix == "data.actor.account.nrql.totalResult.count" and event == "number":
+                total_results = int(value)
+            elif prefix == "errors.item.message" and event == "string":
+                errors.append(value)
+
+        if errors:
+            raise Exception(f"GraphQL errors: {'; '.join(errors)}")
+
+        return logs, total_results, was_truncated
+
     async def query_logs(self, request: LogQueryRequest) -> LogQueryResponse:
         """Query New Relic logs.
-        
+
+        Concurrent callers arriving within the batch window are coalesced
+        into a single GraphQL request (see query_logs_batch); a lone caller
+        pays one extra event-loop tick and goes out alone.
+
         Args:
             request: Log query request
-            
+
         Returns:
             Log query response with results
         """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((request, future))
+        if len(self._pending) == 1:
+            asyncio.ensure_future(self._flush_pending())
+        return await future
+
+    async def _flush_pending(self):
+        """Send all requests queued during the batch window and resolve their futures."""
+        await asyncio.sleep(BATCH_WINDOW_SECONDS)
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            chunk = pending[start:start + MAX_BATCH_SIZE]
+            try:
+                if len(chunk) == 1:
+                    responses = [await self._query_logs_single(chunk[0][0])]
+                else:
+                    responses = await self.query_logs_batch([request for request, _ in chunk])
+            except Exception as e:
+                for _, future in chunk:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), response in zip(chunk, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    async def query_logs_many(self, requests: List[LogQueryRequest],
+                              max_concurrency: int = 10) -> List[LogQueryResponse]:
+        """Run several log queries concurrently.
+
+        A semaphore bounds in-flight queries so a large fan-out (e.g. one
+        query per account) does not trample NRDB rate limits; the shared
+        connection pool and the batching window do the rest.
+
+        Args:
+            requests: Log query requests to execute
+            max_concurrency: Maximum queries in flight at once
+
+        Returns:
+            One LogQueryResponse per request, in order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(request: LogQueryRequest) -> LogQueryResponse:
+            async with semaphore:
+                return await self.query_logs(request)
+
+        return list(await asyncio.gather(*(run_one(request) for request in requests)))
+
+    async def query_logs_batch(self, requests: List[LogQueryRequest]) -> List[LogQueryResponse]:
+        """Execute several log queries in one GraphQL request.
+
+        Each request becomes an aliased account/nrql field in a single
+        document, so N queries cost one HTTPS round-trip instead of N.
+
+        Args:
+            requests: Log query requests to execute together
+
+        Returns:
+            One LogQueryResponse per request, in order
+        """
+        nrqls = [self._build_nrql_query(request) for request in requests]
+
+        var_defs = ", ".join(
+            f"$accountId{i}: Int!, $nrql{i}: Nrql!" for i in range(len(requests)))
+        fields = "\n".join(
+            f"q{i}: account(id: $accountId{i}) {{ nrql(query: $nrql{i}) {{ results totalResult }} }}"
+            for i in range(len(requests)))
+        document = f"query({var_defs}) {{ actor {{ {fields} }} }}"
+
+        variables: Dict[str, Any] = {}
+        for i, (request, nrql) in enumerate(zip(requests, nrqls)):
+            variables[f"accountId{i}"] = int(request.account_id)
+            variables[f"nrql{i}"] = nrql
+
+        logger.info("Executing batched NRQL query for %d requests", len(requests))
+
+        response = await self._post({"query": document, "variables": variables})
+        data = orjson.loads(response.content)
+
+        if "errors" in data:
+            error_messages = [err.get("message", "Unknown error") for err in data["errors"]]
+            raise Exception(f"GraphQL errors: {'; '.join(error_messages)}")
+
+        actor = data.get("data", {}).get("actor", {})
+        responses = []
+        with _gc_paused(sum(request.limit for request in requests) > GC_PAUSE_THRESHOLD):
+            for i, (request, nrql) in enumerate(zip(requests, nrqls)):
+                nrql_data = (actor.get(f"q{i}") or {}).get("nrql") or {}
+                results = nrql_data.get("results", [])
+
+                total_results = len(results)
+                total_result = nrql_data.get("totalResult")
+                if total_result:
+                    total_results = total_result.get("count", len(results))
+
+                # Same size budget as the streaming path, applied per sub-query.
+                # The row count is known up front, so pre-size the list instead
+                # of growing it append by append.
+                logs: List[LogEntry] = [None] * len(results)
+                kept = 0
+                was_truncated = False
+                total_size = self._RESPONSE_OVERHEAD
+                for result in results:
+                    log = self._row_to_log_entry(result)
+                    total_size += self._entry_size(log)
+                    if total_size > MAX_RESPONSE_SIZE and kept:
+                        was_truncated = True
+                        break
+                    logs[kept] = log
+                    kept += 1
+                del logs[kept:]
+
+                original_limit = None
+                truncated_reason = None
+                if was_truncated:
+                    original_limit = request.limit
+                    truncated_reason = f"Response exceeded the {MAX_RESPONSE_SIZE} character limit. Stopped after {len(logs)} logs."
+                    logger.warning("Truncated logs response: %s", truncated_reason)
+
+                responses.append(LogQueryResponse(
+                    logs=logs,
+                    total_results=total_results,
+                    query_executed=nrql,
+                    truncated=was_truncated,
+                    truncated_reason=truncated_reason,
+                    original_limit=original_limit
+                ))
+
+        return responses
+
+    def _encoded_log_query_body(self, account_id: str, nrql: str) -> bytes:
+        """Pre-encoded request body for one (account, NRQL) pair.
+
+        Repeat invocations with the same shape send the exact same bytes,
+        so encode once and serve from a small LRU instead of re-running
+        JSON encoding per call.
+        """
+        key = (account_id, nrql)
+        body = self._body_cache.get(key)
+        if body is not None:
+            self._body_cache.move_to_end(key)
+            return body
+        body = orjson.dumps({
+            "query": LOG_QUERY_GQL,
+            "variables": {"accountId": int(account_id), "nrql": nrql}
+        })
+        self._body_cache[key] = body
+        if len(self._body_cache) > BODY_CACHE_SIZE:
+            self._body_cache.popitem(last=False)
+        return body
+
+    async def _query_logs_single(self, request: LogQueryRequest) -> LogQueryResponse:
+        """Execute a single log query over the streaming path."""
         nrql = self._build_nrql_query(request)
-        logger.info(f"Executing NRQL query: {nrql}")
-        
-        graphql_query = """
-        {
-          actor {
-            account(id: %s) {
-              nrql(query: "%s") {
-                results
-                totalResult
-                metadata {
-                  eventTypes
-                  facets
-                  messages
-                }
-              }
-            }
-          }
-        }
-        """ % (request.account_id, nrql.replace('"', '\\"'))
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
+        logger.info("Executing NRQL query: %s", nrql)
+
+        body = self._encoded_log_query_body(request.account_id, nrql)
+
+        for attempt in range(MAX_RETRIES):
+            async with self._client.stream(
+                "POST",
                 self.endpoint,
-                headers=self.headers,
-                json={"query": graphql_query}
-            )
-            
-            if response.status_code == 429:
-                raise Exception("Rate limit exceeded. Please wait before retrying.")
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            if "errors" in data:
-                error_messages = [err.get("message", "Unknown error") for err in data["errors"]]
-                raise Exception(f"GraphQL errors: {'; '.join(error_messages)}")
-            
-            # Extract results
-            nrql_data = data.get("data", {}).get("actor", {}).get("account", {}).get("nrql", {})
-            results = nrql_data.get("results", [])
-            
-            # Convert to LogEntry objects
-            logs = []
-            for result in results:
-                log_entry = LogEntry(
-                    timestamp=result.get("timestamp"),
-                    message=result.get("message", ""),
-                    level=result.get("level", "INFO"),
-                    attributes={k: v for k, v in result.items() 
-                              if k not in ["timestamp", "message", "level"]}
-                )
-                logs.append(log_entry)
-            
-            total_results = len(results)
-            if nrql_data.get("totalResult"):
-                total_results = nrql_data["totalResult"].get("count", len(results))
-            
-            # Check if we need to truncate due to response size
-            truncated_logs, was_truncated = self._truncate_logs_to_size(logs, MAX_RESPONSE_SIZE)
-            original_limit = None
-            truncated_reason = None
-            
-            if was_truncated:
-                original_limit = request.limit
-                truncated_reason = f"Response too large ({self._estimate_response_size(logs)} chars). Reduced from {len(logs)} to {len(truncated_logs)} logs to fit within {MAX_RESPONSE_SIZE} character limit."
-                logger.warning(f"Truncated logs response: {truncated_reason}")
-                logs = truncated_logs
-            
-            return LogQueryResponse(
-                logs=logs,
-                total_results=total_results,
-                query_executed=nrql,
-                truncated=was_truncated,
-                truncated_reason=truncated_reason,
-                original_limit=original_limit
-            )
+                content=body
+            ) as response:
+                if response.status_code != 429:
+                    response.raise_for_status()
+                    with _gc_paused(request.limit > GC_PAUSE_THRESHOLD):
+                        logs, total_results, was_truncated = await self._parse_log_stream(
+                            response, MAX_RESPONSE_SIZE)
+                    break
+                delay = self._retry_delay(response, attempt)
+                logger.warning("Rate limited (attempt %d/%d); retrying in %.1fs", attempt + 1, MAX_RETRIES, delay)
+            await asyncio.sleep(delay)
+        else:
+            raise Exception(f"Rate limit exceeded after {MAX_RETRIES} attempts. Please wait before retrying.")
+
+        if total_results is None:
+            total_results = len(logs)
+
+        original_limit = None
+        truncated_reason = None
+
+        if was_truncated:
+            original_limit = request.limit
+            truncated_reason = f"Response exceeded the {MAX_RESPONSE_SIZE} character limit. Stopped after {len(logs)} logs."
+            logger.warning("Truncated logs response: %s", truncated_reason)
+
+        return LogQueryResponse(
+            logs=logs,
+            total_results=total_results,
+            query_executed=nrql,
+            truncated=was_truncated,
+            truncated_reason=truncated_reason,
+            original_limit=original_limit
+        )
     
     async def get_account_id(self, account_name: str) -> str:
         """Get account ID by account name.
-        
+
+        The full account list is fetched once and cached as a name -> ID
+        map, so repeat lookups are a dict hit instead of a GraphQL
+        round-trip until the TTL expires.
+
         Args:
             account_name: Name of the New Relic account
-            
+
         Returns:
             Account ID
         """
-        graphql_query = """
-        {
-          actor {
-            accounts {
-              id
-              name
-            }
-          }
-        }
-        """
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                self.endpoint,
-                headers=self.headers,
-                json={"query": graphql_query}
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            if "errors" in data:
-                error_messages = [err.get("message", "Unknown error") for err in data["errors"]]
-                raise Exception(f"GraphQL errors: {'; '.join(error_messages)}")
-            
-            accounts = data.get("data", {}).get("actor", {}).get("accounts", [])
-            
-            for account in accounts:
-                if account.get("name", "").lower() == account_name.lower():
-                    return str(account.get("id"))
-            
-            raise Exception(f"Account '{account_name}' not found. Available accounts: {', '.join([a.get('name', 'Unknown') for a in accounts])}")
\ No newline at end of file
+        if self._account_map is None or time.monotonic() - self._account_map_time > ACCOUNT_CACHE_TTL:
+            async with self._account_lock:
+                # Another caller may have refreshed while we waited.
+                if self._account_map is None or time.monotonic() - self._account_map_time > ACCOUNT_CACHE_TTL:
+                    response = await self._post(ACCOUNTS_PAYLOAD)
+                    data = orjson.loads(response.content)
+
+                    if "errors" in data:
+                        error_messages = [err.get("message", "Unknown error") for err in data["errors"]]
+                        raise Exception(f"GraphQL errors: {'; '.join(error_messages)}")
+
+                    accounts = data.get("data", {}).get("actor", {}).get("accounts", [])
+                    self._account_map = {
+                        account.get("name", "").lower(): str(account.get("id"))
+                        for account in accounts
+                    }
+                    self._account_names = [account.get("name", "Unknown") for account in accounts]
+                    self._account_map_time = time.monotonic()
+
+        account_id = self._account_map.get(account_name.lower())
+        if account_id is not None:
+            return account_id
+
+        raise Exception(f"Account '{account_name}' not found. Available accounts: {', '.join(self._account_names)}")
\ No newline at end of file
@@ -1,50 +1,80 @@
 """Data models for New Relic MCP server."""
 
-import json
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Union
 
+import orjson
+
+
+@dataclass(slots=True)
+class LogEntry:
+    """Represents a single log entry from New Relic.
+
+    A plain slotted dataclass rather than a pydantic model: entries are
+    created up to LIMIT times per query from data the client just decoded
+    itself, so they carry no validation machinery and no per-instance
+    __dict__.
+    """
+
+    timestamp: Optional[int] = None  # Unix timestamp in milliseconds
+    message: str = ""
+    level: str = "INFO"  # ERROR, WARN, INFO, DEBUG
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    _timestamp_str: Optional[str] = field(default=None, init=False, repr=False)
 
-class LogEntry(BaseModel):
-    """Represents a single log entry from New Relic."""
-    
-    timestamp: Optional[int] = Field(None, description="Unix timestamp in milliseconds")
-    message: str = Field(..., description="Log message content")
-    level: str = Field("INFO", description="Log level (ERROR, WARN, INFO, DEBUG)")
-    attributes: Dict[str, Any] = Field(default_factory=dict, description="Additional log attributes")
-    
     @property
     def timestamp_str(self) -> str:
-        """Get timestamp as ISO format string."""
-        if self.timestamp:
-            return datetime.fromtimestamp(self.timestamp / 1000).isoformat() + "Z"
-        return ""
+        """Get timestamp as ISO format string (formatted once per entry)."""
+        if self._timestamp_str is None:
+            if self.timestamp:
+                self._timestamp_str = datetime.fromtimestamp(self.timestamp / 1000).isoformat() + "Z"
+            else:
+                self._timestamp_str = ""
+        return self._timestamp_str
 
 
-class LogQueryRequest(BaseModel):
-    """Request parameters for querying logs."""
-    
-    account_id: str = Field(..., description="New Relic account ID")
-    query: Optional[str] = Field(None, description="Full NRQL query (overrides other parameters)")
-    message_search: Optional[str] = Field(None, description="Search text in message field")
-    filters: Optional[Dict[str, str]] = Field(None, description="Key-value pairs for filtering")
-    since: str = Field("1 hour ago", description="Time range for query")
-    limit: int = Field(100, ge=1, le=2000, description="Maximum number of results")
+@dataclass(slots=True)
+class LogQueryRequest:
+    """Request parameters for querying logs.
 
+    Validated at the MCP boundary by the compiled input schema
+    (server.QUERY_LOGS_SCHEMA); inside the process it is just a slotted
+    carrier of the arguments.
+    """
 
-class LogQueryResponse(BaseModel):
+    account_id: str
+    query: Optional[str] = None  # Full NRQL query (overrides other parameters)
+    fields: Optional[List[str]] = None  # Attributes to return (default: timestamp, message, level)
+    message_search: Optional[str] = None  # Search text in message field
+    filters: Optional[Dict[str, Union[str, int, float, bool]]] = None
+    since: str = "1 hour ago"
+    limit: int = 100  # Schema-enforced range: 1..2000
+
+
+@dataclass(slots=True)
+class LogQueryResponse:
     """Response from log query."""
-    
-    logs: List[LogEntry] = Field(..., description="List of log entries")
-    total_results: int = Field(..., description="Total number of results (may exceed limit)")
-    query_executed: str = Field(..., description="The NRQL query that was executed")
-    truncated: bool = Field(False, description="Whether results were truncated due to size limits")
-    truncated_reason: Optional[str] = Field(None, description="Reason for truncation if applicable")
-    original_limit: Optional[int] = Field(None, description="Original limit before auto-adjustment")
-    
-    def to_json(self) -> str:
-        """Convert response to formatted JSON string."""
+
+    logs: List[LogEntry]
+    total_results: int  # Total number of results (may exceed limit)
+    query_executed: str
+    truncated: bool = False
+    truncated_reason: Optional[str] = None
+    original_limit: Optional[int] = None  # Original limit before auto-adjustment
+    _json_bytes: Optional[bytes] = field(default=None, init=False, repr=False)
+    _json_cache: Optional[str] = field(default=None, init=False, repr=False)
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize the response to UTF-8 JSON bytes (built once, then cached).
+
+        Byte-oriented consumers should prefer this over to_json; the str
+        form is just one decode of these bytes, so nothing is serialized
+        twice.
+        """
+        if self._json_bytes is not None:
+            return self._json_bytes
+
         data = {
             "logs": [
                 {
@@ -67,4 +97,11 @@ class LogQueryResponse(BaseModel):
             if self.original_limit:
                 data["original_limit"] = self.original_limit
         
-        return json.dumps(data, indent=2)
\ No newline at end of file
+        self._json_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return self._json_bytes
+
+    def to_json(self) -> str:
+        """Convert response to formatted JSON string (decoded once from the cached bytes)."""
+        if self._json_cache is None:
+            self._json_cache = self.to_json_bytes().decode("utf-8")
+        return self._json_cache
\ No newline at end of file
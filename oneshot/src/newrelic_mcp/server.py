@@ -6,6 +6,7 @@ import logging
 import sys
 from typing import Any, Dict, Optional
 
+import fastjsonschema
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
@@ -19,6 +20,79 @@ from .models import LogQueryRequest, LogQueryResponse
 logging.basicConfig(level=logging.INFO, stream=sys.stderr)
 logger = logging.getLogger(__name__)
 
+# Tool definitions are static, so build them (and their nested schema dicts)
+# once at import instead of on every tools/list request.
+QUERY_LOGS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "account_id": {
+            "type": "string",
+            "description": "New Relic account ID"
+        },
+        "query": {
+            "type": "string",
+            "description": "Full NRQL query (overrides other parameters)"
+        },
+        "fields": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Log attributes to return (default: timestamp, message, level)"
+        },
+        "message_search": {
+            "type": "string",
+            "description": "Search text in message field"
+        },
+        "filters": {
+            "type": "object",
+            "description": "Key-value pairs for filtering",
+            "additionalProperties": {"type": ["string", "number", "boolean"]}
+        },
+        "since": {
+            "type": "string",
+            "description": "Time range (e.g., '1 hour ago')",
+            "default": "1 hour ago"
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Maximum number of results",
+            "default": 100,
+            "minimum": 1,
+            "maximum": 2000
+        }
+    },
+    "required": ["account_id"],
+    "additionalProperties": False
+}
+
+GET_ACCOUNT_ID_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "account_name": {
+            "type": "string",
+            "description": "Name of the New Relic account"
+        }
+    },
+    "required": ["account_name"],
+    "additionalProperties": False
+}
+
+_QUERY_LOGS_TOOL = Tool(
+    name="query_logs",
+    description="Query New Relic logs using NRQL or simple filters",
+    inputSchema=QUERY_LOGS_SCHEMA
+)
+
+_GET_ACCOUNT_ID_TOOL = Tool(
+    name="get_account_id",
+    description="Look up New Relic account ID by name",
+    inputSchema=GET_ACCOUNT_ID_SCHEMA
+)
+
+# Validators compiled from the same schemas the tools advertise; roughly an
+# order of magnitude cheaper per call than pydantic's field-by-field pass.
+_VALIDATE_QUERY_LOGS = fastjsonschema.compile(QUERY_LOGS_SCHEMA)
+_VALIDATE_GET_ACCOUNT_ID = fastjsonschema.compile(GET_ACCOUNT_ID_SCHEMA)
+
 
 class NewRelicMCPServer:
     """MCP Server for New Relic API interactions."""
@@ -26,120 +100,87 @@ class NewRelicMCPServer:
     def __init__(self):
         logger.info("Initializing New Relic MCP Server...")
         self.server = Server("newrelic-mcp")
-        self.client: Optional[NewRelicClient] = None
-        
-        # Check environment variables
-        api_key = os.getenv("NEW_RELIC_API_KEY")
-        endpoint = os.getenv("NEW_RELIC_API_ENDPOINT", "https://api.newrelic.com/graphql")
-        
-        if api_key:
-            logger.info(f"✓ NEW_RELIC_API_KEY found (length: {len(api_key)})")
+
+        # Resolve credentials once at startup; re-reading the environment on
+        # every tool call bought nothing and let racing first calls each
+        # construct (and leak) their own client.
+        self._api_key = os.getenv("NEW_RELIC_API_KEY")
+        self._endpoint = os.getenv("NEW_RELIC_API_ENDPOINT", "https://api.newrelic.com/graphql")
+
+        if self._api_key:
+            logger.info("✓ NEW_RELIC_API_KEY found (length: %d)", len(self._api_key))
+            self.client: Optional[NewRelicClient] = NewRelicClient(self._api_key, self._endpoint)
         else:
             logger.warning("⚠ NEW_RELIC_API_KEY not set - will fail when tools are called")
-        
-        logger.info(f"✓ API Endpoint: {endpoint}")
-        
+            self.client = None
+
+        logger.info("✓ API Endpoint: %s", self._endpoint)
+
+        # Tool objects are module-level constants; keep the returned list
+        # (and its serialized form, for anything that re-emits the schemas)
+        # built exactly once per server instead of per tools/list call.
+        self._tools = [_QUERY_LOGS_TOOL, _GET_ACCOUNT_ID_TOOL]
+        self._tools_json = [tool.model_dump() for tool in self._tools]
+
+        # Tool name -> bound handler; call_tool dispatches with one dict
+        # lookup, and registering a tool means adding an entry here rather
+        # than lengthening an if/elif chain.
+        self._handlers = {
+            "query_logs": self._handle_query_logs,
+            "get_account_id": self._handle_get_account_id,
+        }
+
         self._setup_handlers()
         logger.info("✓ MCP handlers configured")
-    
+
+    async def _handle_query_logs(self, arguments: Dict[str, Any]) -> list[TextContent]:
+        """Handle the query_logs tool."""
+        # The compiled validator enforces the advertised schema and fills
+        # defaults before the dataclass is built.
+        arguments = _VALIDATE_QUERY_LOGS(arguments)
+        request = LogQueryRequest(**arguments)
+        result = await self.client.query_logs(request)
+        return [TextContent(type="text", text=result.to_json())]
+
+    async def _handle_get_account_id(self, arguments: Dict[str, Any]) -> list[TextContent]:
+        """Handle the get_account_id tool."""
+        arguments = _VALIDATE_GET_ACCOUNT_ID(arguments)
+        account_name = arguments.get("account_name")
+        account_id = await self.client.get_account_id(account_name)
+        return [TextContent(
+            type="text",
+            text=f"Account ID for '{account_name}': {account_id}"
+        )]
+
     def _setup_handlers(self):
         """Set up MCP protocol handlers."""
         
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """List available New Relic tools."""
-            return [
-                Tool(
-                    name="query_logs",
-                    description="Query New Relic logs using NRQL or simple filters",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "account_id": {
-                                "type": "string",
-                                "description": "New Relic account ID"
-                            },
-                            "query": {
-                                "type": "string",
-                                "description": "Full NRQL query (overrides other parameters)"
-                            },
-                            "message_search": {
-                                "type": "string",
-                                "description": "Search text in message field"
-                            },
-                            "filters": {
-                                "type": "object",
-                                "description": "Key-value pairs for filtering",
-                                "additionalProperties": {"type": "string"}
-                            },
-                            "since": {
-                                "type": "string",
-                                "description": "Time range (e.g., '1 hour ago')",
-                                "default": "1 hour ago"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of results",
-                                "default": 100
-                            }
-                        },
-                        "required": ["account_id"],
-                        "additionalProperties": False
-                    }
-                ),
-                Tool(
-                    name="get_account_id",
-                    description="Look up New Relic account ID by name",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "account_name": {
-                                "type": "string",
-                                "description": "Name of the New Relic account"
-                            }
-                        },
-                        "required": ["account_name"],
-                        "additionalProperties": False
-                    }
-                )
-            ]
+            return self._tools
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Dict[str, Any]) -> list[TextContent | ImageContent | EmbeddedResource]:
             """Execute a New Relic tool."""
             if not self.client:
-                api_key = os.getenv("NEW_RELIC_API_KEY")
-                if not api_key:
-                    return [TextContent(
-                        type="text",
-                        text="Error: NEW_RELIC_API_KEY environment variable not set"
-                    )]
-                
-                endpoint = os.getenv("NEW_RELIC_API_ENDPOINT", "https://api.newrelic.com/graphql")
-                self.client = NewRelicClient(api_key, endpoint)
-            
+                return [TextContent(
+                    type="text",
+                    text="Error: NEW_RELIC_API_KEY environment variable not set"
+                )]
+
+            handler = self._handlers.get(name)
+            if handler is None:
+                return [TextContent(
+                    type="text",
+                    text=f"Unknown tool: {name}"
+                )]
+
             try:
-                if name == "query_logs":
-                    request = LogQueryRequest(**arguments)
-                    result = await self.client.query_logs(request)
-                    return [TextContent(type="text", text=result.to_json())]
-                
-                elif name == "get_account_id":
-                    account_name = arguments.get("account_name")
-                    account_id = await self.client.get_account_id(account_name)
-                    return [TextContent(
-                        type="text",
-                        text=f"Account ID for '{account_name}': {account_id}"
-                    )]
-                
-                else:
-                    return [TextContent(
-                        type="text",
-                        text=f"Unknown tool: {name}"
-                    )]
-                    
+                return await handler(arguments)
+
             except Exception as e:
-                logger.error(f"Error executing tool {name}: {e}")
+                logger.error("Error executing tool %s: %s", name, e)
                 return [TextContent(
                     type="text",
                     text=f"Error: {str(e)}"
@@ -155,18 +196,22 @@ class NewRelicMCPServer:
         from mcp.server.stdio import stdio_server
         
         logger.info("Setting up stdio transport...")
-        async with stdio_server() as (read_stream, write_stream):
-            logger.info("🚀 MCP Server ready - waiting for client connections...")
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="newrelic-mcp",
-                    server_version="0.1.0",
-                    capabilities=ServerCapabilities(
-                        tools={}
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                logger.info("🚀 MCP Server ready - waiting for client connections...")
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="newrelic-mcp",
+                        server_version="0.1.0",
+                        capabilities=ServerCapabilities(
+                            tools={}
+                        )
                     )
                 )
-            )
+        finally:
+            if self.client:
+                await self.client.aclose()
 
 
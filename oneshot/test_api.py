@@ -4,18 +4,20 @@
 import asyncio
 import logging
 import os
+import re
 import sys
 from pathlib import Path
 
+import orjson
+
+# Matches KEY=value lines, skipping comments; one pass over the whole file.
+_ENV_LINE_RE = re.compile(r'^\s*(?!#)([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$', re.M)
+
 # Load .env file if it exists
 env_file = Path(__file__).parent / ".env"
 if env_file.exists():
-    with open(env_file) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ[key] = value
+    for key, value in _ENV_LINE_RE.findall(env_file.read_text()):
+        os.environ[key] = value
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -26,94 +28,114 @@ from newrelic_mcp.models import LogQueryRequest
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Built once; the accounts probe body never changes between runs.
+_ACCOUNTS_PAYLOAD = {
+    "query": """
+    {
+      actor {
+        accounts {
+          id
+          name
+        }
+      }
+    }
+    """
+}
+
+
+async def probe_accounts(client):
+    """Test 1: list accounts; returns the account list or None on failure."""
+    logger.info("\n📋 Testing account listing...")
+
+    # Reuse the client's pooled connection instead of opening a new one
+    response = await client._client.post(
+        client.endpoint,
+        json=_ACCOUNTS_PAYLOAD
+    )
+
+    if response.status_code != 200:
+        logger.error("❌ HTTP %d: %s", response.status_code, response.text)
+        return None
+
+    data = orjson.loads(response.content)
+    if "errors" in data:
+        logger.error("❌ GraphQL errors: %s", data['errors'])
+        return None
+
+    accounts = data.get("data", {}).get("actor", {}).get("accounts", [])
+    logger.info("✓ Found %d accounts:", len(accounts))
+    for account in accounts[:3]:  # Show first 3
+        logger.info("  - %s (ID: %s)", account.get('name', 'Unknown'), account.get('id'))
+
+    return accounts
+
+
+async def probe_logs(client, account_id):
+    """Test 2: simple log query on one account; returns True on success."""
+    logger.info("\n🔍 Testing log query on account %s...", account_id)
+
+    request = LogQueryRequest(
+        account_id=account_id,
+        message_search="",  # Empty search to get any logs
+        since="1 day ago",
+        limit=5
+    )
+
+    try:
+        response = await client.query_logs(request)
+        logger.info("✓ Query successful! Found %d logs (total: %d)", len(response.logs), response.total_results)
+        logger.info("✓ Query executed: %s", response.query_executed)
+
+        if response.logs:
+            logger.info("📄 Sample log entries:")
+            for i, log in enumerate(response.logs[:2]):  # Show first 2
+                logger.info("  %d. [%s] %s: %s...", i + 1, log.level, log.timestamp_str, log.message[:100])
+        else:
+            logger.info("ℹ No logs found in the time range")
+
+        return True
+
+    except Exception as e:
+        logger.error("❌ Log query failed: %s", e)
+        return False
+
 
 async def test_api_connectivity():
     """Test basic API connectivity."""
     logger.info("🧪 Testing New Relic API integration...")
-    
+
     api_key = os.getenv("NEW_RELIC_API_KEY")
     if not api_key:
         logger.error("❌ NEW_RELIC_API_KEY environment variable not set")
         return False
-    
-    logger.info(f"✓ API Key found (length: {len(api_key)})")
-    
+
+    logger.info("✓ API Key found (length: %d)", len(api_key))
+
+    client = NewRelicClient(api_key)
+    logger.info("✓ Client initialized")
+
     try:
-        client = NewRelicClient(api_key)
-        logger.info("✓ Client initialized")
-        
-        # Test 1: Get accounts
-        logger.info("\n📋 Testing account listing...")
-        accounts_query = """
-        {
-          actor {
-            accounts {
-              id
-              name
-            }
-          }
-        }
-        """
-        
-        import httpx
-        async with httpx.AsyncClient(timeout=30.0) as http_client:
-            response = await http_client.post(
-                client.endpoint,
-                headers=client.headers,
-                json={"query": accounts_query}
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ HTTP {response.status_code}: {response.text}")
-                return False
-            
-            data = response.json()
-            if "errors" in data:
-                logger.error(f"❌ GraphQL errors: {data['errors']}")
-                return False
-            
-            accounts = data.get("data", {}).get("actor", {}).get("accounts", [])
-            logger.info(f"✓ Found {len(accounts)} accounts:")
-            for account in accounts[:3]:  # Show first 3
-                logger.info(f"  - {account.get('name', 'Unknown')} (ID: {account.get('id')})")
-            
-            if not accounts:
-                logger.warning("⚠ No accounts found - this may indicate permission issues")
-                return False
-        
-        # Test 2: Try a simple log query on the first account
-        if accounts:
-            test_account_id = str(accounts[0]["id"])
-            logger.info(f"\n🔍 Testing log query on account {test_account_id}...")
-            
-            request = LogQueryRequest(
-                account_id=test_account_id,
-                message_search="",  # Empty search to get any logs
-                since="1 day ago",
-                limit=5
-            )
-            
-            try:
-                response = await client.query_logs(request)
-                logger.info(f"✓ Query successful! Found {len(response.logs)} logs (total: {response.total_results})")
-                logger.info(f"✓ Query executed: {response.query_executed}")
-                
-                if response.logs:
-                    logger.info("📄 Sample log entries:")
-                    for i, log in enumerate(response.logs[:2]):  # Show first 2
-                        logger.info(f"  {i+1}. [{log.level}] {log.timestamp_str}: {log.message[:100]}...")
-                else:
-                    logger.info("ℹ No logs found in the time range")
-                
-                return True
-                
-            except Exception as e:
-                logger.error(f"❌ Log query failed: {e}")
-                return False
-    
+        accounts = await probe_accounts(client)
+        if accounts is None:
+            return False
+
+        if not accounts:
+            logger.warning("⚠ No accounts found - this may indicate permission issues")
+            return False
+
+        # The log probes only depend on the account listing, not on each
+        # other, so fire them concurrently over the shared HTTP/2 client:
+        # wall-clock is the slowest probe rather than the sum of them.
+        results = await asyncio.gather(
+            *(probe_logs(client, str(account["id"])) for account in accounts[:2])
+        )
+        return all(results)
+
     except Exception as e:
-        logger.error(f"❌ API test failed: {e}")
+        logger.error("❌ API test failed: %s", e)
         return False
+    finally:
+        await client.aclose()
 
 
 async def main():